@@ -0,0 +1,60 @@
+"""
+JSON Prediction API
+Single and batched risk scoring with per-feature explanations
+"""
+
+from flask import jsonify, request
+
+from explain import describe_contributions
+from features import build_features_batch, parse_user_data
+
+
+def score_users(model_data, users, wellness_score, recommendations):
+    """Scale, predict and explain a list of user_data dicts as one batch"""
+    features_scaled = model_data['scaler'].transform(build_features_batch(users))
+    predictions = model_data['model'].predict(features_scaled)
+    explainer = model_data['explainer']
+    contributions = explainer.explain_batch(features_scaled)
+    results = []
+    for user_data, prediction, row in zip(users, predictions, contributions):
+        explanation = describe_contributions(explainer.bias, row)
+        results.append({
+            'risk': 'HIGH RISK' if prediction == 1 else 'LOW RISK',
+            'prediction': int(prediction),
+            'risk_probability': explanation['risk_probability'],
+            'wellness_score': wellness_score(user_data),
+            'recommendations': recommendations(user_data, prediction),
+            'explanation': explanation
+        })
+    return results
+
+
+def init_api(app, model_data, wellness_score, recommendations):
+    """Attach /api/predict and /api/predict/batch to a Flask app.
+
+    wellness_score and recommendations are the app's rule functions, applied
+    to each scored user alongside the model output.
+    """
+
+    def score(users):
+        return score_users(model_data, users, wellness_score, recommendations)
+
+    @app.route('/api/predict', methods=['POST'])
+    def api_predict():
+        try:
+            user_data = parse_user_data(request.get_json(force=True))
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({'error': f"Invalid input: {e}"}), 400
+        return jsonify(score([user_data])[0])
+
+    @app.route('/api/predict/batch', methods=['POST'])
+    def api_predict_batch():
+        payload = request.get_json(force=True)
+        records = payload.get('records') if isinstance(payload, dict) else None
+        if not records:
+            return jsonify({'error': "Expected a non-empty 'records' list"}), 400
+        try:
+            users = [parse_user_data(record) for record in records]
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({'error': f"Invalid input: {e}"}), 400
+        return jsonify({'results': score(users)})
@@ -1,10 +1,17 @@
 from flask import Flask, render_template_string, request, redirect, url_for
-import numpy as np
 import pickle
 from phq9 import PHQ9_QUESTIONS, PHQ9_OPTIONS, calculate_phq9_score
+from profiler import init_profiler
+from features import build_features, parse_user_data
+from explain import ForestExplainer
+from api import init_api
+from whatif import what_if_sweep
 
 app = Flask(__name__)
 
+# Opt-in sampling profiler (enabled by setting EMOS_PROFILER_TOKEN)
+profiler = init_profiler(app)
+
 # Claude-inspired color palette and chat bubble style
 BASE_STYLE = '''
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap" rel="stylesheet">
@@ -371,6 +378,16 @@ RESULT_HTML = '''
     <ul style="margin-top: 0;">
     {% for rec in recommendations %}<li>{{ rec }}</li>{% endfor %}
     </ul>
+    {% if what_if.suggestions %}
+    <p><b>What Could Lower Your Risk:</b></p>
+    <ul style="margin-top: 0;">
+    {% for s in what_if.suggestions %}<li>{{ s.changes | join(' and ') }}: risk {{ '%.0f' % (what_if.baseline_risk * 100) }}% &rarr; {{ '%.0f' % (s.risk_probability * 100) }}%{% if s.flips %} (LOW RISK){% endif %}</li>{% endfor %}
+    </ul>
+    {% endif %}
+    <p><b>Why This Result:</b></p>
+    <ul style="margin-top: 0;">
+    {% for c in explanation.contributions[:5] if c.contribution %}<li>{{ c.label }}: {{ '%.1f' % (c.contribution | abs * 100) }}% {{ 'towards' if c.contribution > 0 else 'away from' }} high risk</li>{% endfor %}
+    </ul>
     <a href="/">Back to Home</a>
   </div>
 </div></body></html>
@@ -419,7 +436,9 @@ with open('mental_health_model.pkl', 'rb') as f:
     loaded = pickle.load(f)
     model_data = {
         'model': loaded['model'],
-        'scaler': loaded['scaler']
+        'scaler': loaded['scaler'],
+        # Per-node contributions are precomputed here so explanations cost about one prediction
+        'explainer': ForestExplainer(loaded['model'])
     }
 
 def calculate_wellness_score(user_data):
@@ -472,44 +491,18 @@ def home():
 
 @app.route('/result', methods=['POST'])
 def result():
-    # Get form data
-    sleep_duration = float(request.form['sleep_duration'])
-    quality_of_sleep = int(request.form['quality_of_sleep'])
-    physical_activity = request.form['physical_activity']
-    physical_activity_level = {'Low': 30, 'Moderate': 50, 'High': 75}[physical_activity]
-    stress_level = int(request.form['stress_level'])
-    heart_rate = int(request.form['heart_rate'])
-    daily_steps = int(request.form['daily_steps'])
-    mood_swings = 'mood_swings' in request.form
-    screen_time = int(request.form['screen_time'])
-    social_interactions = int(request.form['social_interactions'])
-
-    user_data = {
-        'sleep_duration': sleep_duration,
-        'quality_of_sleep': quality_of_sleep,
-        'physical_activity_level': physical_activity_level,
-        'stress_level': stress_level,
-        'heart_rate': heart_rate,
-        'daily_steps': daily_steps,
-        'physical_activity': physical_activity,
-        'mood_swings': mood_swings,
-        'screen_time': screen_time,
-        'social_interactions': social_interactions
-    }
-    sleep_efficiency = sleep_duration * quality_of_sleep / 10
-    activity_stress_ratio = physical_activity_level / (stress_level + 1)
-    sleep_quality_ratio = quality_of_sleep / sleep_duration
-    features = np.array([
-        sleep_duration, quality_of_sleep, physical_activity_level,
-        stress_level, heart_rate, daily_steps,
-        sleep_efficiency, activity_stress_ratio, sleep_quality_ratio
-    ]).reshape(1, -1)
+    user_data = parse_user_data(request.form)
+    features = build_features(user_data)
     features_scaled = model_data['scaler'].transform(features)
     prediction = model_data['model'].predict(features_scaled)[0]
     wellness_score = calculate_wellness_score(user_data)
     recommendations = get_personalized_recommendations(user_data, prediction)
+    what_if = what_if_sweep(model_data['model'], model_data['scaler'], user_data)
+    explanation = model_data['explainer'].explain(features_scaled)
     risk = 'HIGH RISK' if prediction == 1 else 'LOW RISK'
-    return render_template_string(RESULT_HTML, risk=risk, wellness_score=wellness_score, recommendations=recommendations)
+    return render_template_string(RESULT_HTML, risk=risk, wellness_score=wellness_score, recommendations=recommendations, what_if=what_if, explanation=explanation)
+
+init_api(app, model_data, calculate_wellness_score, get_personalized_recommendations)
 
 @app.route('/phq9', methods=['GET', 'POST'])
 def phq9():
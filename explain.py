@@ -0,0 +1,81 @@
+"""
+Forest Feature Contributions
+Exact path-based decomposition of the RandomForest's risk probability
+"""
+
+import numpy as np
+
+from features import FEATURE_LABELS, FEATURE_NAMES
+
+
+class ForestExplainer:
+    """Splits each prediction into a bias plus one contribution per feature.
+
+    Walking a tree from root to leaf, every split moves the node's class
+    probability by value[child] - value[parent]; that change is credited to
+    the split feature. A tree's path is fixed by its leaf, so the deltas are
+    summed along every root-to-leaf path once at load into a
+    (total_leaves, n_features) table. Explaining rows is then one
+    model.apply call plus a gather-sum over that table, and
+    bias + contributions.sum() equals predict_proba exactly.
+    """
+
+    def __init__(self, model, positive_class=1):
+        self.model = model
+        self.class_index = list(model.classes_).index(positive_class)
+        n_features = model.n_features_in_
+        n_trees = len(model.estimators_)
+
+        tables, leaf_rows, node_offsets, roots = [], [], [], []
+        n_nodes = n_leaves = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            value = tree.value[:, 0, :]
+            prob = value[:, self.class_index] / value.sum(axis=1)
+            # Node ids are assigned depth-first, so a parent always precedes its children
+            path = np.zeros((tree.node_count, n_features))
+            for node in np.flatnonzero(tree.children_left != -1):
+                for child in (tree.children_left[node], tree.children_right[node]):
+                    path[child] = path[node]
+                    path[child, tree.feature[node]] += prob[child] - prob[node]
+            leaves = tree.children_left == -1
+            rows = np.full(tree.node_count, -1)
+            rows[leaves] = np.arange(n_leaves, n_leaves + leaves.sum())
+            tables.append(path[leaves])
+            leaf_rows.append(rows)
+            node_offsets.append(n_nodes)
+            roots.append(prob[0])
+            n_nodes += tree.node_count
+            n_leaves += leaves.sum()
+
+        self.bias = float(np.mean(roots))
+        self.leaf_contributions = np.concatenate(tables) / n_trees
+        # Maps (tree node offset + node id from model.apply) to a leaf_contributions row
+        self.leaf_rows = np.concatenate(leaf_rows)
+        self.node_offsets = np.array(node_offsets)
+
+    def explain_batch(self, features_scaled):
+        """Per-feature contributions for each row, shape (n_rows, n_features)"""
+        leaves = self.model.apply(features_scaled) + self.node_offsets
+        return self.leaf_contributions[self.leaf_rows[leaves]].sum(axis=1)
+
+    def explain(self, features_scaled):
+        """Contributions for a single row, largest effect first"""
+        return describe_contributions(self.bias, self.explain_batch(features_scaled)[0])
+
+
+def describe_contributions(bias, contributions):
+    """JSON-friendly explanation for one row of explain_batch output"""
+    order = np.argsort(-np.abs(contributions), kind='stable')
+    return {
+        'bias': round(bias, 4),
+        'risk_probability': round(bias + float(contributions.sum()), 4),
+        'contributions': [
+            {
+                'feature': FEATURE_NAMES[i],
+                'label': FEATURE_LABELS[FEATURE_NAMES[i]],
+                'contribution': round(float(contributions[i]), 4)
+            }
+            for i in order
+        ]
+    }
@@ -0,0 +1,95 @@
+"""
+Model Feature Construction
+Builds the 9-feature vectors the risk model was trained on
+"""
+
+import numpy as np
+
+ACTIVITY_LEVELS = {'Low': 30, 'Moderate': 50, 'High': 75}
+
+RAW_FEATURES = [
+    'sleep_duration', 'quality_of_sleep', 'physical_activity_level',
+    'stress_level', 'heart_rate', 'daily_steps'
+]
+
+FEATURE_NAMES = RAW_FEATURES + [
+    'sleep_efficiency', 'activity_stress_ratio', 'sleep_quality_ratio'
+]
+
+FEATURE_LABELS = {
+    'sleep_duration': 'Sleep Duration',
+    'quality_of_sleep': 'Quality of Sleep',
+    'physical_activity_level': 'Physical Activity',
+    'stress_level': 'Stress Level',
+    'heart_rate': 'Resting Heart Rate',
+    'daily_steps': 'Daily Steps',
+    'sleep_efficiency': 'Sleep Efficiency',
+    'activity_stress_ratio': 'Activity / Stress Ratio',
+    'sleep_quality_ratio': 'Sleep Quality Ratio'
+}
+
+
+def build_feature_matrix(raw):
+    """Derive the full feature matrix from an (n, 6) array of RAW_FEATURES"""
+    raw = np.asarray(raw, dtype=float).reshape(-1, len(RAW_FEATURES))
+    sleep_duration, quality_of_sleep, physical_activity_level, stress_level = raw[:, :4].T
+    sleep_efficiency = sleep_duration * quality_of_sleep / 10
+    activity_stress_ratio = physical_activity_level / (stress_level + 1)
+    sleep_quality_ratio = quality_of_sleep / sleep_duration
+    return np.column_stack([raw, sleep_efficiency, activity_stress_ratio, sleep_quality_ratio])
+
+
+def build_features_batch(users):
+    """Feature matrix with one row per user_data dict"""
+    return build_feature_matrix([[user_data[name] for name in RAW_FEATURES] for user_data in users])
+
+
+def build_features(user_data):
+    """Single-row feature matrix for a user_data dict"""
+    return build_features_batch([user_data])
+
+
+# field -> (type, lowest allowed, highest allowed)
+INPUT_RANGES = {
+    'sleep_duration': (float, 0.5, 24),
+    'quality_of_sleep': (int, 1, 10),
+    'stress_level': (int, 0, 10),
+    'heart_rate': (int, 30, 220),
+    'daily_steps': (int, 0, 100000),
+    'screen_time': (int, 0, 24),
+    'social_interactions': (int, 0, 100)
+}
+
+
+def _parse_number(values, name):
+    cast, low, high = INPUT_RANGES[name]
+    try:
+        number = cast(values[name])
+    except OverflowError:
+        raise ValueError(f"{name} must be a finite number")
+    if not np.isfinite(number) or not low <= number <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return number
+
+
+def _parse_mood_swings(value):
+    # JSON sends true/false; an HTML checkbox sends "on" when ticked and nothing otherwise
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if value == 'on':
+        return True
+    raise ValueError("mood_swings must be true or false")
+
+
+def parse_user_data(values):
+    """Build user_data from submitted form fields or a JSON object.
+
+    Raises KeyError for missing fields and ValueError for values that are
+    not numbers, not finite or outside INPUT_RANGES.
+    """
+    physical_activity = values['physical_activity']
+    user_data = {name: _parse_number(values, name) for name in INPUT_RANGES}
+    user_data['physical_activity'] = physical_activity
+    user_data['physical_activity_level'] = ACTIVITY_LEVELS[physical_activity]
+    user_data['mood_swings'] = _parse_mood_swings(values.get('mood_swings'))
+    return user_data
@@ -0,0 +1,183 @@
+"""
+On-demand Sampling Profiler
+Admin-only, opt-in stack sampling of request threads with collapsed-stack output
+"""
+
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Response, abort, request
+
+DEFAULT_INTERVAL = 0.005
+MAX_SECONDS = 600
+
+
+class SamplingProfiler:
+    """Periodically samples the stacks of enrolled request threads.
+
+    While no session is running the request hooks only read a boolean,
+    so the profiler costs nothing measurable when disabled.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.active = False
+        self.sample_rate = 1.0
+        self.deadline = None
+        self.started_at = None
+        self.stacks = Counter()
+        self.samples = 0
+        self.requests_sampled = 0
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._sampler = None
+
+    def start(self, sample_rate=1.0, seconds=None):
+        """Start a session sampling a fraction of requests, optionally for N seconds"""
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate must be in (0, 1]")
+        if seconds is not None and not 0 < seconds <= MAX_SECONDS:
+            raise ValueError(f"seconds must be in (0, {MAX_SECONDS}]")
+        self.stop()
+        with self._lock:
+            self.stacks = Counter()
+            self.samples = 0
+            self.requests_sampled = 0
+            self._threads = set()
+            self.sample_rate = sample_rate
+            self.started_at = time.time()
+            self.deadline = time.monotonic() + seconds if seconds else None
+            self.active = True
+        self._sampler = threading.Thread(target=self._run, name='emos-profiler', daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop the running session, keeping the collected samples"""
+        self.active = False
+        sampler, self._sampler = self._sampler, None
+        if sampler is not None and sampler is not threading.current_thread():
+            sampler.join()
+
+    def enter_request(self):
+        if not self.active or random.random() >= self.sample_rate:
+            return
+        with self._lock:
+            self._threads.add(threading.get_ident())
+            self.requests_sampled += 1
+
+    def exit_request(self):
+        if not self._threads:
+            return
+        with self._lock:
+            self._threads.discard(threading.get_ident())
+
+    def _run(self):
+        while self.active:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.active = False
+                break
+            with self._lock:
+                threads = tuple(self._threads)
+            if threads:
+                frames = sys._current_frames()
+                collected = [_collapse(frames[ident]) for ident in threads if ident in frames]
+                with self._lock:
+                    for stack in collected:
+                        self.stacks[stack] += 1
+                        self.samples += 1
+            time.sleep(self.interval)
+
+    def status(self):
+        with self._lock:
+            return {
+                'active': self.active,
+                'sample_rate': self.sample_rate,
+                'started_at': self.started_at,
+                'seconds_remaining': max(0.0, self.deadline - time.monotonic()) if self.active and self.deadline else None,
+                'requests_sampled': self.requests_sampled,
+                'samples': self.samples,
+                'unique_stacks': len(self.stacks)
+            }
+
+    def collapsed(self):
+        """Aggregated samples in collapsed-stack format (flamegraph.pl / speedscope)"""
+        with self._lock:
+            items = sorted(self.stacks.items())
+        return ''.join(f"{stack} {count}\n" for stack, count in items)
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def _require_admin():
+    token = os.environ.get('EMOS_PROFILER_TOKEN')
+    if not token:
+        abort(404)
+    supplied = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        abort(403)
+
+
+def init_profiler(app, profiler=None):
+    """Attach request hooks and the /admin/profile endpoints to a Flask app.
+
+    The endpoints only exist when EMOS_PROFILER_TOKEN is set, and every call
+    must send that token in the X-Admin-Token header.
+    """
+    profiler = profiler or SamplingProfiler(
+        float(os.environ.get('EMOS_PROFILER_INTERVAL', DEFAULT_INTERVAL))
+    )
+
+    @app.before_request
+    def _profiler_enter():
+        if profiler.active and not request.path.startswith('/admin/profile'):
+            profiler.enter_request()
+
+    @app.teardown_request
+    def _profiler_exit(exc):
+        profiler.exit_request()
+
+    @app.route('/admin/profile/start', methods=['POST'])
+    def profile_start():
+        _require_admin()
+        try:
+            sample_rate = float(request.values.get('sample_rate', 1.0))
+            seconds = request.values.get('seconds')
+            profiler.start(sample_rate, float(seconds) if seconds else None)
+        except ValueError as e:
+            abort(400, str(e))
+        return profiler.status()
+
+    @app.route('/admin/profile/stop', methods=['POST'])
+    def profile_stop():
+        _require_admin()
+        profiler.stop()
+        return profiler.status()
+
+    @app.route('/admin/profile', methods=['GET'])
+    def profile_status():
+        _require_admin()
+        return profiler.status()
+
+    @app.route('/admin/profile/collapsed', methods=['GET'])
+    def profile_collapsed():
+        _require_admin()
+        return Response(
+            profiler.collapsed(),
+            mimetype='text/plain',
+            headers={'Content-Disposition': 'attachment; filename=emos-profile.collapsed'}
+        )
+
+    app.extensions['emos_profiler'] = profiler
+    return profiler
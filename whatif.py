@@ -0,0 +1,138 @@
+"""
+What-if Recommendations
+Scores a grid of realistic lifestyle changes against the risk model in one batch
+"""
+
+from itertools import product
+
+import numpy as np
+
+from features import ACTIVITY_LEVELS, RAW_FEATURES, build_feature_matrix
+
+ACTIVITY_ORDER = ['Low', 'Moderate', 'High']
+MAX_CHANGES = 2
+MAX_SUGGESTIONS = 3
+# Smaller drops in predicted risk are model noise rather than advice
+MIN_RISK_REDUCTION = 0.02
+
+# raw feature -> (candidate deltas, lower bound, upper bound, label format)
+# Physical activity deltas are steps along ACTIVITY_ORDER rather than raw levels.
+WHAT_IF_CHANGES = {
+    'sleep_duration': ([1.0, 2.0], 3.0, 10.0, "Sleep {:+g}h"),
+    'quality_of_sleep': ([1, 2], 1, 10, "Sleep quality {:+g}"),
+    'physical_activity_level': ([1, 2], 0, len(ACTIVITY_ORDER) - 1, None),
+    'stress_level': ([-1, -2, -3], 0, 10, "Stress {:+g}"),
+    'heart_rate': ([-5, -10], 50, 120, "Resting heart rate {:+g} bpm"),
+    'daily_steps': ([2000, 4000], 1000, 15000, "Daily steps {:+,g}"),
+}
+
+
+def _build_delta_grid():
+    # Columns follow RAW_FEATURES so the grid lines up with the user's base vector
+    options = [[0] + WHAT_IF_CHANGES[name][0] for name in RAW_FEATURES]
+    grid = np.array(
+        [row for row in product(*options) if sum(d != 0 for d in row) <= MAX_CHANGES],
+        dtype=float
+    )
+    # Keep the unchanged baseline as row 0
+    return grid[np.argsort(np.count_nonzero(grid, axis=1), kind='stable')]
+
+
+DELTA_GRID = _build_delta_grid()
+_LOWER = np.array([WHAT_IF_CHANGES[name][1] for name in RAW_FEATURES], dtype=float)
+_UPPER = np.array([WHAT_IF_CHANGES[name][2] for name in RAW_FEATURES], dtype=float)
+_ACTIVITY_VALUES = np.array([ACTIVITY_LEVELS[level] for level in ACTIVITY_ORDER], dtype=float)
+_ACTIVITY_COLUMN = RAW_FEATURES.index('physical_activity_level')
+# Smallest candidate step per feature, used to compare the size of different changes
+_STEP = np.array([min(abs(d) for d in WHAT_IF_CHANGES[name][0]) for name in RAW_FEATURES], dtype=float)
+
+
+def _perturb(user_data):
+    """Apply DELTA_GRID to the user's raw features, returning the grid and the applied deltas"""
+    base = np.array([user_data[name] for name in RAW_FEATURES], dtype=float)
+    base[_ACTIVITY_COLUMN] = ACTIVITY_ORDER.index(user_data['physical_activity'])
+    # Never move a value the wrong way when the user is already outside the bounds
+    perturbed = np.clip(base + DELTA_GRID, np.minimum(_LOWER, base), np.maximum(_UPPER, base))
+    applied = perturbed - base
+    raw = perturbed.copy()
+    raw[:, _ACTIVITY_COLUMN] = _ACTIVITY_VALUES[perturbed[:, _ACTIVITY_COLUMN].astype(int)]
+    return raw, applied
+
+
+def _describe(applied_row, user_data):
+    changes = []
+    for name, delta in zip(RAW_FEATURES, applied_row):
+        if delta == 0:
+            continue
+        if name == 'physical_activity_level':
+            current = ACTIVITY_ORDER.index(user_data['physical_activity'])
+            target = min(current + int(delta), len(ACTIVITY_ORDER) - 1)
+            changes.append(f"Activity {ACTIVITY_ORDER[current]} to {ACTIVITY_ORDER[target]}")
+        else:
+            changes.append(WHAT_IF_CHANGES[name][3].format(delta))
+    return changes
+
+
+def _is_part_of(smaller, larger):
+    """True if every change in smaller also appears in larger, in the same direction and no bigger"""
+    changed = smaller != 0
+    return bool(np.all(
+        (np.sign(smaller[changed]) == np.sign(larger[changed]))
+        & (np.abs(smaller[changed]) <= np.abs(larger[changed]))
+    ))
+
+
+def what_if_sweep(model, scaler, user_data, max_suggestions=MAX_SUGGESTIONS):
+    """Find the lifestyle changes that most reduce the model's predicted risk.
+
+    Every perturbed feature vector is scaled and scored in a single
+    predict_proba call. Returns the baseline risk probability and the best
+    suggestions: changes that flip the prediction first, then the lowest
+    resulting risk, then the smallest total change. Suggestions that cut
+    risk by less than MIN_RISK_REDUCTION, or that only add to or enlarge an
+    already chosen suggestion without lowering risk further, are skipped.
+    """
+    raw, applied = _perturb(user_data)
+    # Drop rows where clipping collapsed a change to a no-op; they duplicate smaller rows
+    effective = np.count_nonzero(applied, axis=1) == np.count_nonzero(DELTA_GRID, axis=1)
+    raw, applied = raw[effective], applied[effective]
+    # Clipping can also turn different deltas into the same change (e.g. +1h and +2h
+    # both becoming +0.5h); keep the first occurrence so row 0 stays the baseline
+    _, unique_rows = np.unique(applied, axis=0, return_index=True)
+    unique_rows.sort()
+    raw, applied = raw[unique_rows], applied[unique_rows]
+
+    features_scaled = scaler.transform(build_feature_matrix(raw))
+    high_risk_column = list(model.classes_).index(1)
+    risk = model.predict_proba(features_scaled)[:, high_risk_column]
+
+    # predict() breaks a 0.5 tie towards class 0, so match it here
+    flips = (risk <= 0.5) & (risk[0] > 0.5)
+    # Compare at the precision we report so float noise doesn't split ties
+    risk = np.round(risk, 3)
+    baseline = float(risk[0])
+    reduction = np.round(baseline - risk, 3)
+    effort = (np.abs(applied) / _STEP).sum(axis=1)
+    # Sort by: flips first, then lowest risk, then the smallest total change
+    order = np.lexsort((effort, risk, ~flips))
+
+    chosen = []
+    for i in order:
+        if i == 0 or reduction[i] < MIN_RISK_REDUCTION:
+            continue
+        if any(risk[j] <= risk[i] and _is_part_of(applied[j], applied[i]) for j in chosen):
+            continue
+        chosen.append(i)
+        if len(chosen) >= max_suggestions:
+            break
+
+    suggestions = [
+        {
+            'changes': _describe(applied[i], user_data),
+            'risk_probability': float(risk[i]),
+            'risk_reduction': float(reduction[i]),
+            'flips': bool(flips[i])
+        }
+        for i in chosen
+    ]
+    return {'baseline_risk': baseline, 'suggestions': suggestions}